@@ -1,6 +1,7 @@
 import argparse
 import os
 import os.path
+import sys
 import time
 import typing
 
@@ -16,28 +17,56 @@ def build_command(
     name: str,
     command: Command,
     root_directory: str,
+    selected: bool,
 ) -> None:
     parser = subparser.add_parser(name=name, help=command.help)
-    command.args(parser, root_directory)
+
+    # Only import the command module that will run
+    if selected:
+        command.args(parser, root_directory)
 
 
 def build_menu(
-    parser: argparse.ArgumentParser, menu: Menu, root_directory: str, depth: int = 0
+    parser: argparse.ArgumentParser,
+    menu: Menu,
+    root_directory: str,
+    path: typing.Sequence[str],
+    depth: int = 0,
 ) -> None:
     subparser = parser.add_subparsers(dest=f"_{depth}", required=True)
 
     for option_name, option in menu.options.items():
+        selected = bool(path) and path[0] == option_name
+
         if isinstance(option, Command):
-            build_command(subparser, option_name, option, root_directory)
+            build_command(subparser, option_name, option, root_directory, selected)
         elif isinstance(option, Menu):
             build_menu(
                 subparser.add_parser(name=option_name, help=option.help),
                 option,
                 root_directory,
+                path[1:] if selected else [],
                 depth + 1,
             )
 
 
+def select_path(menu: Menu, argv: typing.Sequence[str]) -> typing.List[str]:
+    path: typing.List[str] = []
+
+    option: typing.Union[Command, Menu] = menu
+    for arg in argv:
+        if arg.startswith("-"):
+            continue
+
+        if not isinstance(option, Menu) or arg not in option.options:
+            break
+
+        path.append(arg)
+        option = option.options[arg]
+
+    return path
+
+
 def run_menu(
     args: typing.Any, menu: Menu, cli_context: CliContext, depth: int = 0
 ) -> bool:
@@ -61,7 +90,7 @@ def cli() -> int:
         "--quiet", action="store_true", help="Turn off logging", default=False
     )
 
-    build_menu(parser, CLI, root_directory)
+    build_menu(parser, CLI, root_directory, select_path(CLI, sys.argv[1:]))
 
     args = parser.parse_args()
 
@@ -84,9 +113,9 @@ def cli() -> int:
 
     console.print(f"[bold blue]ctf-builder[/] - [yellow]{' '.join(path)}[/]\n")
 
-    start = time.time()
+    start = time.perf_counter()
     is_ok = run_menu(args, CLI, cli_context)
-    end = time.time()
+    end = time.perf_counter()
 
     delta = end - start
     delta_str = f"{delta:.2f}s"
@@ -49,6 +49,7 @@ def cli_args(parser: argparse.ArgumentParser, root_directory: str) -> None:
 def cli(args: Args, cli_context: CliContext) -> bool:
     context = Context(
         challenge_path="",
+        challenge_index=-1,
         error_prefix=[],
         skip_inactive=False,
         docker_client=cli_context.docker_client,
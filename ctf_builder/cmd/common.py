@@ -1,6 +1,7 @@
 import argparse
+import concurrent.futures
 import dataclasses
-import json
+import itertools
 import os
 import os.path
 import threading
@@ -10,21 +11,27 @@ import typing
 import docker
 import docker.errors
 import docker.models.networks
+import pydantic_core
 import rich.console
 import rich.control
 import rich.progress
 
-from ..config import CHALLENGE_MAX_PORTS
+from ..config import CHALLENGE_MAX_PORTS, CHALLENGE_READ_WORKERS
 from ..error import BuildError, LibError, SkipError, get_exit_status, print_errors
 from ..models.challenge import Track
 
 
 MAX_TCP_PORT = 65_535
 
+CHALLENGES_CACHE: typing.Dict[str, typing.Tuple[int, typing.List[str]]] = {}
+CHALLENGE_JSON_CACHE: typing.Dict[str, typing.Tuple[typing.Tuple[int, int], bytes]] = {}
+CHALLENGE_TRACK_CACHE: typing.Dict[str, typing.Tuple[bytes, Track]] = {}
+
 
 @dataclasses.dataclass(frozen=True)
 class WrapContext:
     challenge_path: str
+    challenge_index: int
     error_prefix: typing.List[str]
     skip_inactive: bool
 
@@ -55,18 +62,13 @@ class ErrorArgumentParser(argparse.ArgumentParser):
         raise ExitError(message)
 
 
-def port_generator(port: int) -> typing.Generator[typing.Optional[int], None, None]:
-    max_port = min(port + CHALLENGE_MAX_PORTS, MAX_TCP_PORT)
-    while True:
-        if port < 0 or port > max_port:
-            break
-
-        yield port
+def port_generator(port: int) -> typing.Iterator[typing.Optional[int]]:
+    if port < 0:
+        return itertools.repeat(None)
 
-        port += 1
+    max_port = min(port + CHALLENGE_MAX_PORTS, MAX_TCP_PORT)
 
-    while True:
-        yield None
+    return itertools.chain(range(port, max_port + 1), itertools.repeat(None))
 
 
 def get_network(
@@ -106,70 +108,114 @@ def get_challenges(root_directory: str) -> typing.Optional[typing.Sequence[str]]
         return []
 
     challenge_directory = os.path.join(root_directory, "challenges")
-    if not os.path.isdir(challenge_directory):
+
+    try:
+        mtime = os.stat(challenge_directory).st_mtime_ns
+    except FileNotFoundError:
         return None
 
-    challenges = []
-    for _, directories, _ in os.walk(challenge_directory):
-        for directory in directories:
-            challenges.append(directory)
+    # Adding or removing a challenge updates the directory mtime
+    cached = CHALLENGES_CACHE.get(challenge_directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
 
-        break
+    try:
+        with os.scandir(challenge_directory) as it:
+            challenges = sorted(entry.name for entry in it if entry.is_dir())
+    except (FileNotFoundError, NotADirectoryError):
+        return None
 
-    challenges = sorted(challenges)
+    CHALLENGES_CACHE[challenge_directory] = (mtime, challenges)
 
     return challenges
 
 
-def get_challenge_index(challenge_path: str) -> int:
-    challenges = get_challenges(os.path.dirname(os.path.dirname(challenge_path)))
-    assert challenges is not None
+def read_challenge_json(json_path: str) -> bytes:
+    file_stat = os.stat(json_path)
+    key = (file_stat.st_mtime_ns, file_stat.st_size)
 
-    return challenges.index(os.path.basename(challenge_path))
+    cached = CHALLENGE_JSON_CACHE.get(json_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
+    with open(json_path, "rb") as h:
+        data = h.read()
 
-def copy_context(
-    context: WrapContext, overrides: typing.Mapping[str, typing.Any]
-) -> WrapContext:
-    fields = {}
-    for field in dataclasses.fields(context.__class__):
-        fields[field.name] = getattr(context, field.name)
+    CHALLENGE_JSON_CACHE[json_path] = (key, data)
 
-    for key, value in overrides.items():
-        fields[key] = value
+    return data
 
-    return context.__class__(**fields)
 
+def prefetch_challenge_json(challenge_path: str) -> None:
+    try:
+        read_challenge_json(os.path.join(challenge_path, "challenge.json"))
+    except OSError:
+        pass
 
-def cli_challenge(
-    context: WrapContext,
-    callback: typing.Callable[[Track, WrapContext], typing.Sequence[LibError]],
-    errors: typing.List[LibError],
-) -> bool:
-    json_path = os.path.join(context.challenge_path, "challenge.json")
-    if not os.path.isfile(json_path):
-        errors.append(BuildError(context="challenge.json", msg="is not a file"))
+
+def is_challenge_inactive(challenge_path: str) -> bool:
+    json_path = os.path.join(challenge_path, "challenge.json")
+    try:
+        raw_json = read_challenge_json(json_path)
+    except OSError:
         return False
 
+    # Invalid tracks still run so their errors are reported
+    track = parse_challenge_json(json_path, raw_json, [])
+
+    return track is not None and not track.active
+
+
+def parse_challenge_json(
+    json_path: str, raw_json: bytes, errors: typing.List[LibError]
+) -> typing.Optional[Track]:
+    # Unchanged files return the same cached bytes object
+    cached = CHALLENGE_TRACK_CACHE.get(json_path)
+    if cached is not None and cached[0] is raw_json:
+        return cached[1]
+
     try:
-        with open(json_path) as h:
-            raw_track = json.load(h)
+        raw_track = pydantic_core.from_json(raw_json)
     except Exception as e:
         errors.append(
             BuildError(context="challenge.json", msg="is not valid JSON", error=e)
         )
-        return False
+        return None
 
     track, parse_errors = Track.parse(raw_track)
     if track is None or parse_errors:
-        errors += parse_errors
+        errors.extend(parse_errors)
+        return None
+
+    CHALLENGE_TRACK_CACHE[json_path] = (raw_json, track)
+
+    return track
+
+
+def cli_challenge(
+    context: WrapContext,
+    callback: typing.Callable[[Track, WrapContext], typing.Sequence[LibError]],
+    errors: typing.List[LibError],
+) -> bool:
+    json_path = os.path.join(context.challenge_path, "challenge.json")
+    try:
+        raw_json = read_challenge_json(json_path)
+    except OSError:
+        errors.append(BuildError(context="challenge.json", msg="is not a file"))
+        return False
+
+    if (track := parse_challenge_json(json_path, raw_json, errors)) is None:
         return False
 
     if context.skip_inactive and not track.active:
         errors.append(SkipError())
         return False
 
-    errors += callback(track, context)
+    try:
+        errors.extend(callback(track, context))
+    except Exception as e:
+        # Worker threads drop exceptions, report them on the track
+        errors.append(BuildError(context="Track", msg="failed unexpectedly", error=e))
 
     return not errors
 
@@ -183,9 +229,10 @@ def cli_challenge_wrapper(
 ) -> bool:
     skip_inactive = challenges is None
 
+    all_challenges = get_challenges(root_directory)
+
     if challenges is None:
-        next_challenges = get_challenges(root_directory)
-        if next_challenges is None:
+        if all_challenges is None:
             print_errors(
                 console=console,
                 errors=[
@@ -198,17 +245,37 @@ def cli_challenge_wrapper(
 
             return False
 
-        challenges = next_challenges
+        challenges = all_challenges
+
+    challenge_indices = {c: i for i, c in enumerate(all_challenges or [])}
+
+    challenges_directory = os.path.join(root_directory, "challenges")
+    challenge_paths = {
+        challenge: os.path.join(challenges_directory, challenge)
+        for challenge in challenges
+    }
+
+    # Warm challenge.json cache
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=CHALLENGE_READ_WORKERS
+    ) as executor:
+        list(executor.map(prefetch_challenge_json, challenge_paths.values()))
 
     error_map: typing.Dict[str, typing.List[LibError]] = {}
     threads: typing.List[typing.Tuple[threading.Thread, str]] = []
-    for challenge in challenges:
+    for challenge, challenge_path in challenge_paths.items():
         errors: typing.List[LibError] = []
         error_map[challenge] = errors
 
-        challenge_path = os.path.join(root_directory, "challenges", challenge)
-        challenge_context = copy_context(
-            context, {"challenge_path": challenge_path, "skip_inactive": skip_inactive}
+        if skip_inactive and is_challenge_inactive(challenge_path):
+            errors.append(SkipError())
+            continue
+
+        challenge_context = dataclasses.replace(
+            context,
+            challenge_path=challenge_path,
+            challenge_index=challenge_indices.get(challenge, 0),
+            skip_inactive=skip_inactive,
         )
 
         threads.append(
@@ -228,7 +295,16 @@ def cli_challenge_wrapper(
     for thread, _ in threads:
         thread.start()
 
-    all_errors = []
+    running_challenges = set(challenge for _, challenge in threads)
+    for challenge, errors in error_map.items():
+        if challenge in running_challenges:
+            continue
+
+        print_errors(
+            console=console,
+            prefix=context.error_prefix + [challenge],
+            errors=errors,
+        )
 
     with rich.progress.Progress(
         rich.progress.TextColumn("{task.description}"),
@@ -250,13 +326,10 @@ def cli_challenge_wrapper(
                 time.sleep(0.1)
                 continue
 
-            errors = error_map[challenge]
-            all_errors += errors
-
             print_errors(
                 console=console,
                 prefix=context.error_prefix + [challenge],
-                errors=errors,
+                errors=error_map[challenge],
                 elapsed_time=challenge_tasks[challenge].elapsed,
             )
             progress.remove_task(challenge_tasks[challenge].id)
@@ -264,4 +337,6 @@ def cli_challenge_wrapper(
     if console:
         console.control(rich.control.Control.move(0, -1))
 
+    all_errors = list(itertools.chain.from_iterable(error_map.values()))
+
     return get_exit_status(all_errors)
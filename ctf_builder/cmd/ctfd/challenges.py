@@ -1,8 +1,10 @@
 import argparse
+import concurrent.futures
 import dataclasses
+import itertools
 import typing
 
-from ...config import CHALLENGE_BASE_PORT, CHALLENGE_MAX_PORTS
+from ...config import CHALLENGE_BASE_PORT, CHALLENGE_MAX_PORTS, CTFD_POOL_SIZE
 from ...ctfd.api import CTFdAPI
 from ...ctfd.models import (
     CTFdAccessToken,
@@ -16,19 +18,16 @@ from ...ctfd.models import (
     CTFdHint,
 )
 from ...ctfd.session import CTFdSession
-from ...error import BuildError, DeployError, LibError, disable_ssl_warnings
+from ...error import BuildError, LibError, disable_ssl_warnings
 from ...models.attachment import AttachmentContext
 from ...models.challenge import Track
 from ...models.flag import FlagContext
 from ...models.port import ConnectionContext, Port
 from ...models.text import Text, TextContext
-from ..common import (
-    CliContext,
-    WrapContext,
-    cli_challenge_wrapper,
-    get_challenge_index,
-    get_challenges,
-)
+from ..common import CliContext, WrapContext, cli_challenge_wrapper, get_challenges
+
+
+R = typing.TypeVar("R")
 
 
 @dataclasses.dataclass(frozen=True)
@@ -44,6 +43,7 @@ class Args:
 class Context(WrapContext):
     api: CTFdAPI
     port: int
+    executor: concurrent.futures.Executor
 
 
 def build_challenges(
@@ -52,20 +52,20 @@ def build_challenges(
     output = []
     errors = []
 
-    base_port = (
-        context.port + get_challenge_index(context.challenge_path) * CHALLENGE_MAX_PORTS
+    next_port = itertools.count(
+        context.port + context.challenge_index * CHALLENGE_MAX_PORTS
     )
 
-    deploy_ports_list: typing.List[typing.List[typing.Tuple[Port, int]]] = []
-    for deployer in track.deploy:
-        ports: typing.List[typing.Tuple[Port, int]] = []
-        for port in deployer.get_ports():
-            if not port.public:
-                continue
+    # Public ports are numbered consecutively across deployers
+    deploy_ports_list: typing.List[typing.List[typing.Tuple[Port, int]]] = [
+        [(port, next(next_port)) for port in deployer.get_ports() if port.public]
+        for deployer in track.deploy
+    ]
 
-            ports.append((port, base_port))
-            base_port += 1
-        deploy_ports_list.append(ports)
+    hostname = context.api.session.hostname()
+    text_context = TextContext(root=context.challenge_path)
+    challenge_count = len(track.challenges)
+    deploy_count = len(deploy_ports_list)
 
     for i, challenge in enumerate(track.challenges):
         name = track.name
@@ -73,19 +73,30 @@ def build_challenges(
             name += f" - {challenge.name}"
 
         if (
-            description := Text.build_many(
-                challenge.descriptions, TextContext(root=context.challenge_path)
-            )
+            description := Text.build_many(challenge.descriptions, text_context)
         ) is None:
             errors.append(
                 BuildError(context=f"Challenge {i}", msg="has an invalid description")
             )
             continue
 
+        if any(not 0 <= offset < challenge_count for offset in challenge.prerequisites):
+            errors.append(
+                BuildError(
+                    context=f"Challenge {i}",
+                    msg="offset for prerequisites is out of range",
+                )
+            )
+            continue
+
+        if challenge.next is not None and not 0 <= challenge.next < challenge_count:
+            errors.append(
+                BuildError(context=f"Challenge {i}", msg="next is out of range")
+            )
+            continue
+
         if challenge.host is not None:
-            if challenge.host.index < 0 or challenge.host.index >= len(
-                deploy_ports_list
-            ):
+            if not 0 <= challenge.host.index < deploy_count:
                 errors.append(
                     BuildError(
                         context=f"Challenge {i}", msg="has an invalid host index"
@@ -106,7 +117,7 @@ def build_challenges(
             port, port_value = deploy_ports[0]
             connection_info = port.connection_string(
                 ConnectionContext(
-                    host=context.api.session.hostname(),
+                    host=hostname,
                     port=port_value,
                     path=challenge.host.path,
                 )
@@ -128,26 +139,35 @@ def build_challenges(
     return output, errors
 
 
+def send_challenge(
+    req: CTFdChallenge, challenge_id: typing.Optional[int], context: Context
+) -> typing.Tuple[typing.Optional[CTFdChallenge], typing.Sequence[LibError]]:
+    if challenge_id:
+        req.id = challenge_id
+
+        return context.api.update_challenge(req)
+
+    return context.api.create_challenge(req)
+
+
 def send_challenges(
     reqs: typing.List[CTFdChallenge], context: Context
 ) -> typing.Tuple[typing.List[int], typing.Sequence[LibError]]:
-    output = []
+    output: typing.List[int] = []
     errors: typing.List[LibError] = []
 
-    for req in reqs:
-        res_many, res_errors = context.api.get_challenge_by_name(req.name or "")
-
-        challenge_id = None
-        if res_many:
-            challenge_id = res_many[0].id
+    challenges, list_errors = context.api.get_challenges()
+    if list_errors:
+        return output, list_errors
 
-        if challenge_id:
-            req.id = challenge_id
-
-            res, res_errors = context.api.update_challenge(req)
-        else:
-            res, res_errors = context.api.create_challenge(req)
+    # Keep the first challenge for each name
+    existing_ids = {
+        challenge.name: challenge.id for challenge in reversed(challenges or [])
+    }
 
+    for res, res_errors in context.executor.map(
+        lambda req: send_challenge(req, existing_ids.get(req.name), context), reqs
+    ):
         if res is None:
             errors += res_errors
             continue
@@ -163,9 +183,11 @@ def build_flags(
     output = []
     errors: typing.List[LibError] = []
 
+    flag_context = FlagContext(root=context.challenge_path)
+
     for id, challenge in zip(ids, track.challenges):
         for flag_def in challenge.flags:
-            for flag in flag_def.build(FlagContext(root=context.challenge_path)):
+            for flag in flag_def.build(flag_context):
                 output.append(
                     CTFdFlag(
                         id=-1,
@@ -187,25 +209,59 @@ def build_flags(
     return output, errors
 
 
+def diff_entries(
+    existing: typing.Iterable[typing.Tuple[typing.Hashable, int]],
+    reqs: typing.Iterable[typing.Tuple[typing.Hashable, R]],
+) -> typing.Tuple[typing.List[int], typing.List[R]]:
+    existing_ids: typing.Dict[typing.Hashable, typing.List[int]] = {}
+    for key, id in existing:
+        existing_ids.setdefault(key, []).append(id)
+
+    missing: typing.List[R] = []
+    for key, req in reqs:
+        if ids := existing_ids.get(key):
+            ids.pop()
+        else:
+            missing.append(req)
+
+    stale = [id for ids in existing_ids.values() for id in ids]
+
+    return stale, missing
+
+
+def flag_key(flag: CTFdFlag) -> typing.Hashable:
+    return (flag.challenge_id, flag.content, flag.type, flag.data)
+
+
 def send_flags(
     reqs: typing.List[CTFdFlag], context: Context
 ) -> typing.Sequence[LibError]:
+    if not reqs:
+        return []
+
     challenge_ids: typing.Set[int] = set()
     for req in reqs:
         if req.challenge_id is not None:
             challenge_ids.add(req.challenge_id)
 
-    for challenge_id in challenge_ids:
-        flags, _ = context.api.get_flags_in_challenge(challenge_id)
+    flags, list_errors = context.api.get_flags()
+    if list_errors:
+        return list_errors
 
-        if flags:
-            for flag in flags:
-                context.api.delete_flag(flag.id)
+    # Only replace flags that changed
+    stale_ids, missing_reqs = diff_entries(
+        (
+            (flag_key(flag), flag.id)
+            for flag in flags or []
+            if flag.challenge_id in challenge_ids
+        ),
+        ((flag_key(req), req) for req in reqs),
+    )
 
     errors: typing.List[LibError] = []
-    for req in reqs:
-        _, res_errors = context.api.create_flag(req)
+    list(context.executor.map(context.api.delete_flag, stale_ids))
 
+    for _, res_errors in context.executor.map(context.api.create_flag, missing_reqs):
         errors += res_errors
 
     return errors
@@ -217,28 +273,35 @@ def build_attachments(
     errors: typing.List[LibError] = []
     reqs: typing.List[CTFdFileUpload] = []
 
-    for id, challenge in zip(ids, track.challenges):
-        for i, attachment in enumerate(challenge.attachments):
-            if (
-                handle := attachment.build(
-                    AttachmentContext(root=context.challenge_path)
-                )
-            ) is None:
-                errors.append(
-                    BuildError(
-                        context=f"Attachment {i} of challenge {id}", msg="is not valid"
-                    )
-                )
-                continue
+    attachment_context = AttachmentContext(root=context.challenge_path)
+    attachments = [
+        (id, i, attachment)
+        for id, challenge in zip(ids, track.challenges)
+        for i, attachment in enumerate(challenge.attachments)
+    ]
 
-            reqs.append(
-                CTFdFileUpload(
-                    challenge=id,
-                    type=CTFdFileUploadType.Challenge,
-                    file_name=handle.name,
-                    file_data=handle.data,
+    # Directory attachments are zipped, overlap them
+    handles = context.executor.map(
+        lambda entry: entry[2].build(attachment_context), attachments
+    )
+
+    for (id, i, _), handle in zip(attachments, handles):
+        if handle is None:
+            errors.append(
+                BuildError(
+                    context=f"Attachment {i} of challenge {id}", msg="is not valid"
                 )
             )
+            continue
+
+        reqs.append(
+            CTFdFileUpload(
+                challenge=id,
+                type=CTFdFileUploadType.Challenge,
+                file_name=handle.name,
+                file_opener=handle.opener,
+            )
+        )
 
     return reqs, errors
 
@@ -246,21 +309,25 @@ def build_attachments(
 def send_attachments(
     reqs: typing.Sequence[CTFdFileUpload], context: Context
 ) -> typing.Sequence[LibError]:
+    if not reqs:
+        return []
+
     challenge_ids: typing.Set[int] = set()
     for req in reqs:
         challenge_ids.add(req.challenge)
 
-    for challenge_id in challenge_ids:
-        files, _ = context.api.get_files_in_challenge(challenge_id)
-
-        if files:
-            for file in files:
-                context.api.delete_file(file.id)
-
     errors: typing.List[LibError] = []
-    for req in reqs:
-        _, res_errors = context.api.create_file(req)
+    file_ids = [
+        file.id
+        for files, _ in context.executor.map(
+            context.api.get_files_in_challenge, challenge_ids
+        )
+        for file in files or []
+    ]
 
+    list(context.executor.map(context.api.delete_file, file_ids))
+
+    for _, res_errors in context.executor.map(context.api.create_file, reqs):
         errors += res_errors
 
     return errors
@@ -271,12 +338,12 @@ def build_hints(
 ) -> typing.Tuple[typing.List[CTFdHint], typing.Sequence[LibError]]:
     errors: typing.List[LibError] = []
 
+    text_context = TextContext(root=context.challenge_path)
+
     reqs: typing.List[CTFdHint] = []
     for id, challenge in zip(ids, track.challenges):
         for i, hint in enumerate(challenge.hints):
-            content = Text.build_many(
-                hint.texts, TextContext(root=context.challenge_path)
-            )
+            content = Text.build_many(hint.texts, text_context)
             if content is None:
                 errors.append(
                     BuildError(
@@ -292,25 +359,50 @@ def build_hints(
     return reqs, errors
 
 
+def hint_key(hint: CTFdHint) -> typing.Hashable:
+    return (hint.challenge_id, hint.content, hint.cost)
+
+
 def send_hints(
     reqs: typing.Sequence[CTFdHint], context: Context
 ) -> typing.Sequence[LibError]:
+    if not reqs:
+        return []
+
     challenge_ids: typing.Set[int] = set()
     for req in reqs:
         if req.challenge_id is not None:
             challenge_ids.add(req.challenge_id)
 
-    for challenge_id in challenge_ids:
-        hints, _ = context.api.get_hints_in_challenge(challenge_id)
+    hints, list_errors = context.api.get_hints()
+    if list_errors:
+        return list_errors
 
-        if hints:
-            for hint in hints:
-                context.api.delete_hint(hint.id)
+    hint_ids = [hint.id for hint in hints or [] if hint.challenge_id in challenge_ids]
 
     errors: typing.List[LibError] = []
-    for req in reqs:
-        _, res_errors = context.api.create_hint(req)
 
+    # The hint listing leaves out content
+    existing_hints = []
+    for hint, hint_errors in context.executor.map(context.api.get_hint, hint_ids):
+        if hint is None:
+            errors += hint_errors
+            continue
+
+        existing_hints.append(hint)
+
+    if errors:
+        return errors
+
+    # Only replace hints that changed
+    stale_ids, missing_reqs = diff_entries(
+        ((hint_key(hint), hint.id) for hint in existing_hints),
+        ((hint_key(req), req) for req in reqs),
+    )
+
+    list(context.executor.map(context.api.delete_hint, stale_ids))
+
+    for _, res_errors in context.executor.map(context.api.create_hint, missing_reqs):
         errors += res_errors
 
     return errors
@@ -319,49 +411,58 @@ def send_hints(
 def send_references(
     track: Track, ids: typing.List[int], context: Context
 ) -> typing.Sequence[LibError]:
-    errors: typing.List[LibError] = []
+    reqs: typing.List[CTFdChallenge] = []
 
     for id, challenge in zip(ids, track.challenges):
         ctfd_challenge = CTFdChallenge(id=id)
 
-        prerequisites = []
-        for offset in challenge.prerequisites:
-            if offset >= len(ids):
-                errors.append(
-                    BuildError(
-                        context=f"Challenge {id}",
-                        msg="offset for prerequisites is out of range",
-                    )
-                )
-                continue
-
-            prerequisites.append(ids[offset])
-
+        # Offsets are validated in build_challenges
+        prerequisites = [ids[offset] for offset in challenge.prerequisites]
         if prerequisites:
             ctfd_challenge.requirements = CTFdChallengeRequirements(
                 anonymize=True, prerequisites=prerequisites
             )
 
         if challenge.next is not None:
-            if challenge.next < 0 or challenge.next >= len(ids):
-                errors.append(
-                    DeployError(
-                        context=f"Challenge {id}",
-                        msg="next is out of range",
-                    )
-                )
-                continue
-
             ctfd_challenge.next_id = ids[challenge.next]
 
-        if prerequisites or challenge.next:
-            _, res_errors = context.api.update_challenge(ctfd_challenge)
+        if prerequisites or challenge.next is not None:
+            reqs.append(ctfd_challenge)
 
-            errors += res_errors
+    if not reqs:
+        return []
+
+    errors: typing.List[LibError] = []
+    for _, res_errors in context.executor.map(context.api.update_challenge, reqs):
+        errors += res_errors
 
     return errors
 
 
+def deploy_flags(
+    track: Track, ids: typing.List[int], context: Context
+) -> typing.Sequence[LibError]:
+    reqs, errors = build_flags(track, ids, context)
+
+    return [*errors, *send_flags(reqs, context)]
+
+
+def deploy_attachments(
+    track: Track, ids: typing.List[int], context: Context
+) -> typing.Sequence[LibError]:
+    reqs, errors = build_attachments(track, ids, context)
+
+    return [*errors, *send_attachments(reqs, context)]
+
+
+def deploy_hints(
+    track: Track, ids: typing.List[int], context: Context
+) -> typing.Sequence[LibError]:
+    reqs, errors = build_hints(track, ids, context)
+
+    return [*errors, *send_hints(reqs, context)]
+
+
 def deploy_challenge(track: Track, context: Context) -> typing.Sequence[LibError]:
     create_requests, errors = build_challenges(track, context)
     if errors:
@@ -371,23 +472,14 @@ def deploy_challenge(track: Track, context: Context) -> typing.Sequence[LibError
     if errors:
         return errors
 
-    all_errors: typing.List[LibError] = []
-
-    flag_requests, errors = build_flags(track, challenge_ids, context)
-    all_errors += errors
-    all_errors += send_flags(flag_requests, context)
-
-    attachment_requests, errors = build_attachments(track, challenge_ids, context)
-    all_errors += errors
-    all_errors += send_attachments(attachment_requests, context)
-
-    hint_requests, errors = build_hints(track, challenge_ids, context)
-    all_errors += errors
-    all_errors += send_hints(hint_requests, context)
+    # Phases wait on the shared executor, so they run in the track thread
+    phases = [deploy_flags, deploy_attachments, deploy_hints, send_references]
 
-    all_errors += send_references(track, challenge_ids, context)
-
-    return all_errors
+    return list(
+        itertools.chain.from_iterable(
+            phase(track, challenge_ids, context) for phase in phases
+        )
+    )
 
 
 def cli_args(parser: argparse.ArgumentParser, root_directory: str) -> None:
@@ -423,24 +515,28 @@ def cli(args: Args, cli_context: CliContext) -> bool:
     if args.skip_ssl:
         disable_ssl_warnings()
 
-    context = Context(
-        challenge_path="",
-        error_prefix=[],
-        skip_inactive=False,
-        api=CTFdAPI(
-            CTFdSession(
-                url=args.url,
-                access_token=CTFdAccessToken(id=-1, value=args.api_key),
-                verify_ssl=not args.skip_ssl,
-            )
-        ),
-        port=args.port,
-    )
+    # One pool for every track, sized to the shared connection pool
+    with concurrent.futures.ThreadPoolExecutor(max_workers=CTFD_POOL_SIZE) as executor:
+        context = Context(
+            challenge_path="",
+            challenge_index=-1,
+            error_prefix=[],
+            skip_inactive=False,
+            api=CTFdAPI(
+                CTFdSession(
+                    url=args.url,
+                    access_token=CTFdAccessToken(id=-1, value=args.api_key),
+                    verify_ssl=not args.skip_ssl,
+                )
+            ),
+            port=args.port,
+            executor=executor,
+        )
 
-    return cli_challenge_wrapper(
-        root_directory=cli_context.root_directory,
-        challenges=args.challenge if args.challenge else None,
-        context=context,
-        callback=deploy_challenge,
-        console=cli_context.console,
-    )
+        return cli_challenge_wrapper(
+            root_directory=cli_context.root_directory,
+            challenges=args.challenge if args.challenge else None,
+            context=context,
+            callback=deploy_challenge,
+            console=cli_context.console,
+        )
@@ -1,16 +1,13 @@
 import argparse
+import contextlib
 import dataclasses
-import os.path
-import tempfile
 import time
 import typing
 
 import docker
 import docker.models.containers
 import rich.console
-import rich.control
 import rich.markup
-import rich.progress
 
 from ...config import CHALLENGE_BASE_PORT, CHALLENGE_HOST
 from ...ctfd.api import CTFdAPI
@@ -54,6 +51,19 @@ DEV_NAME = "admin"
 DEV_PASSWORD = "admin"
 DEV_EMAIL = "admin@ctfd.io"
 
+# Parser for interactive mode
+INTERACTIVE_PARSER = ErrorArgumentParser(prog="")
+INTERACTIVE_PARSER.add_argument(
+    "-r",
+    "--reload",
+    action="store_true",
+    help="reload challenges",
+    default=False,
+)
+INTERACTIVE_PARSER.add_argument(
+    "-e", "--exit", action="store_true", help="exit program", default=False
+)
+
 
 def dev(args: Args, cli_context: CliContext) -> typing.Sequence[LibError]:
     skip_ssl = True
@@ -63,62 +73,54 @@ def dev(args: Args, cli_context: CliContext) -> typing.Sequence[LibError]:
     ctfd_url = f"http://{args.hostname}:{args.port}"
 
     try:
-        with rich.progress.Progress(
-            rich.progress.TextColumn("{task.description}"),
-            rich.progress.TimeElapsedColumn(),
-            console=cli_context.console,
-        ) as progress:
-            task_id = progress.add_task("container", total=1)
+        # Start container
+        status: typing.ContextManager[typing.Any] = (
+            cli_context.console.status("container")
+            if cli_context.console
+            else contextlib.nullcontext()
+        )
 
-            # Start container
+        start_time = time.perf_counter()
+        with status:
             container, container_errors = ctfd_container(
                 name="ctf-builder_ctfd",
                 docker_client=cli_context.docker_client,
                 port=args.port,
             )
-
-            elapsed = progress.tasks[task_id].elapsed
-            progress.remove_task(task_id)
-
-        if cli_context.console:
-            cli_context.console.control(rich.control.Control.move(0, -1))
+        end_time = time.perf_counter()
 
         print_errors(
             prefix=["container"],
             errors=container_errors,
             console=cli_context.console,
-            elapsed_time=elapsed,
+            elapsed_time=end_time - start_time,
         )
         if container == None or container_errors:
             return container_errors
 
         # Setup CTFd
-        with tempfile.TemporaryDirectory() as temp_dir:
-            setup_path = os.path.join(temp_dir, "setup.json")
-            with open(setup_path, "w") as h:
-                h.write(DEV_SETUP.model_dump_json())
-
-            setup_status = setup_cli(
-                cli_context=cli_context,
-                args=SetupArgs(
-                    url=ctfd_url,
-                    name=DEV_NAME,
-                    email=DEV_EMAIL,
-                    password=DEV_PASSWORD,
-                    file=setup_path,
-                    skip_ssl=skip_ssl,
-                ),
-            )
+        setup_status = setup_cli(
+            cli_context=cli_context,
+            args=SetupArgs(
+                url=ctfd_url,
+                name=DEV_NAME,
+                email=DEV_EMAIL,
+                password=DEV_PASSWORD,
+                file="",
+                skip_ssl=skip_ssl,
+                data=DEV_SETUP,
+            ),
+        )
 
         if not setup_status:
             return [DeployError(context="setup", msg="failed to deploy")]
 
         # Generate API
-        start_time = time.time()
+        start_time = time.perf_counter()
         api = CTFdAPI.login(
             url=ctfd_url, name=DEV_NAME, password=DEV_PASSWORD, verify_ssl=not skip_ssl
         )
-        end_time = time.time()
+        end_time = time.perf_counter()
 
         if api is None:
             login_errors = [DeployError(context="Credentaisl", msg="failed")]
@@ -153,31 +155,16 @@ def dev(args: Args, cli_context: CliContext) -> typing.Sequence[LibError]:
         if args.exit or cli_context.console is None:
             return []
 
-        # Parser for interactive mode
-        parser = ErrorArgumentParser(prog="")
-
-        parser.add_argument(
-            "-r",
-            "--reload",
-            action="store_true",
-            help="reload challenges",
-            default=False,
-        )
-
-        parser.add_argument(
-            "-e", "--exit", action="store_true", help="exit program", default=False
-        )
-
         # Interactive mode
         while True:
             user_input = cli_context.console.input("\n> ").strip()
-            user_args = user_input.split(" ")
+            user_args = user_input.split()
 
             if "-e" not in user_args and "--exit" not in user_args:
                 cli_context.console.print()
 
             try:
-                interactive_args = parser.parse_args(user_args)
+                interactive_args = INTERACTIVE_PARSER.parse_args(user_args)
             except ArgumentError as e:
                 cli_context.console.print(f"[red]{rich.markup.escape(str(e))}[/]")
                 continue
@@ -199,7 +186,7 @@ def dev(args: Args, cli_context: CliContext) -> typing.Sequence[LibError]:
     finally:
         if container is not None:
             try:
-                container.remove(force=True)
+                container.remove(v=True, force=True)
             except:
                 pass
 
@@ -1,6 +1,5 @@
 import argparse
 import dataclasses
-import json
 import os.path
 import time
 import typing
@@ -19,6 +18,7 @@ class Args:
     file: str
     url: str = dataclasses.field(default="http://localhost:8000")
     skip_ssl: bool = dataclasses.field(default=False)
+    data: typing.Optional[CTFdSetup] = dataclasses.field(default=None)
 
 
 @dataclasses.dataclass
@@ -29,13 +29,16 @@ class Context:
     email: str
     file: str
     skip_ssl: bool = dataclasses.field(default=False)
+    data: typing.Optional[CTFdSetup] = dataclasses.field(default=None)
 
 
 def setup(context: Context) -> typing.Sequence[LibError]:
-    with open(context.file, "r") as h:
-        config = json.load(h)
-
-    ctfd_setup = CTFdSetup(**config)
+    if context.data is not None:
+        # Setup fields are overwritten below
+        ctfd_setup = context.data.model_copy()
+    else:
+        with open(context.file, "rb") as h:
+            ctfd_setup = CTFdSetup.model_validate_json(h.read())
 
     ctfd_setup.name = context.name
     ctfd_setup.email = context.email
@@ -79,7 +82,7 @@ def cli(args: Args, cli_context: CliContext) -> bool:
     if args.skip_ssl:
         disable_ssl_warnings()
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     errors = setup(
         Context(
             url=args.url,
@@ -88,9 +91,10 @@ def cli(args: Args, cli_context: CliContext) -> bool:
             email=args.email,
             password=args.password,
             skip_ssl=args.skip_ssl,
+            data=args.data,
         )
     )
-    end_time = time.time()
+    end_time = time.perf_counter()
 
     print_errors(
         prefix=["setup"],
@@ -1,12 +1,13 @@
 import argparse
+import concurrent.futures
 import dataclasses
-import json
 import os.path
+import secrets
 import typing
-import uuid
 
 import pydantic_core
 
+from ...config import CTFD_WORKERS
 from ...ctfd.api import CTFdAPI
 from ...ctfd.models import CTFdAccessToken, CTFdTeam, CTFdUser
 from ...ctfd.session import CTFdSession
@@ -33,6 +34,7 @@ class Args:
 @dataclasses.dataclass(frozen=True)
 class Context:
     api: CTFdAPI
+    team_mode: bool = dataclasses.field(default=True)
 
 
 def deploy_user(user: CTFdUser, context: Context) -> typing.Sequence[LibError]:
@@ -49,7 +51,7 @@ def deploy_user(user: CTFdUser, context: Context) -> typing.Sequence[LibError]:
         res, res_errors = context.api.update_user(user)
     else:
         if not user.password:
-            user.password = str(uuid.uuid4())
+            user.password = secrets.token_urlsafe(16)
 
         res, res_errors = context.api.create_user(user)
 
@@ -62,11 +64,9 @@ def deploy_user(user: CTFdUser, context: Context) -> typing.Sequence[LibError]:
 
 
 def add_user_to_team(
-    team_id: int, user_id: int, context: Context
+    team_id: int, user_id: int, member_ids: typing.Set[int], context: Context
 ) -> typing.Sequence[LibError]:
-    user_ids, _ = context.api.get_users_in_team(team_id)
-
-    if user_ids and user_id in user_ids:
+    if user_id in member_ids:
         return []
 
     is_ok = context.api.add_user_to_team(team_id, user_id)
@@ -82,17 +82,24 @@ def add_user_to_team(
     )
 
 
+def deploy_team_user(
+    team_id: int, user: CTFdUser, member_ids: typing.Set[int], context: Context
+) -> typing.Sequence[LibError]:
+    errors = deploy_user(user, context)
+    if errors or not context.team_mode:
+        return errors
+
+    return add_user_to_team(team_id, user.id, member_ids, context)
+
+
 def deploy_team(
     team: CTFdTeam, users: typing.Sequence[CTFdUser], context: Context
 ) -> typing.Sequence[LibError]:
-    try:
-        data, _ = context.api.get_teams_by_query(team.name or "")
+    member_ids: typing.Set[int] = set()
 
-        solo = False
-    except pydantic_core.ValidationError:
-        solo = True
+    if context.team_mode:
+        data, _ = context.api.get_teams_by_query(team.name or "")
 
-    if not solo:
         res_errors: typing.Sequence[LibError]
 
         if data and any(ctfd_team.name == team.name for ctfd_team in data):
@@ -103,9 +110,14 @@ def deploy_team(
             team.id = ctfd_team.id
 
             res, res_errors = context.api.update_team(team)
+
+            # Only an existing team can already have members
+            if res is not None:
+                user_ids, _ = context.api.get_users_in_team(res.id)
+                member_ids.update(user_ids or [])
         else:
             if not team.password:
-                team.password = str(uuid.uuid4())
+                team.password = secrets.token_urlsafe(16)
 
             res, res_errors = context.api.create_team(team)
 
@@ -116,15 +128,10 @@ def deploy_team(
     else:
         team.id = 0
 
+    # Teams already run concurrently, keep users of a team in order
     errors: typing.List[LibError] = []
     for user in users:
-        user_errors = deploy_user(user, context)
-        if user_errors:
-            errors += user_errors
-            continue
-
-        if not solo:
-            errors += add_user_to_team(team.id, user.id, context)
+        errors += deploy_team_user(team.id, user, member_ids, context)
 
     return errors
 
@@ -132,41 +139,32 @@ def deploy_team(
 def merge_teams_json(
     old: typing.Dict[str, typing.Any], new: typing.Dict[str, typing.Any]
 ) -> typing.Dict[str, typing.Any]:
-    out = {**new}
-
     old_teams = {team["email"]: team for team in old["teams"]}
 
     teams = []
     for new_team in new["teams"]:
-        team = {**new_team}
-
         old_team = old_teams.get(new_team["email"])
         if old_team is None:
-            teams.append(team)
+            teams.append(new_team)
             continue
 
-        if password := old_team.get("password"):
-            team["password"] = password
-
         old_users = {user["email"]: user for user in old_team["users"]}
 
         users = []
         for new_user in new_team["users"]:
-            user = {**new_user}
-
             old_user = old_users.get(new_user["email"])
             if old_user and (password := old_user.get("password")):
-                user["password"] = password
-
-            users.append(user)
+                users.append({**new_user, "password": password})
+            else:
+                users.append(new_user)
 
-        team["users"] = users
+        team = {**new_team, "users": users}
+        if password := old_team.get("password"):
+            team["password"] = password
 
         teams.append(team)
 
-    out["teams"] = teams
-
-    return out
+    return {**new, "teams": teams}
 
 
 def cli_args(parser: argparse.ArgumentParser, root_directory: str) -> None:
@@ -199,59 +197,75 @@ def cli(args: Args, cli_context: CliContext) -> bool:
     if args.skip_ssl:
         disable_ssl_warnings()
 
-    with open(args.file, "r") as h:
-        config = json.load(h)
-
-    team_file = TeamFile(**config)
+    with open(args.file, "rb") as h:
+        team_file = TeamFile.model_validate_json(h.read())
 
-    context = Context(
-        CTFdAPI(
-            CTFdSession(
-                url=args.url,
-                access_token=CTFdAccessToken(id=-1, value=args.api_key),
-                verify_ssl=not args.skip_ssl,
-            )
+    api = CTFdAPI(
+        CTFdSession(
+            url=args.url,
+            access_token=CTFdAccessToken(id=-1, value=args.api_key),
+            verify_ssl=not args.skip_ssl,
         )
     )
 
-    all_errors: typing.List[LibError] = []
+    context = Context(api=api, team_mode=api.is_team_mode())
 
-    teams: typing.List[typing.Dict[str, typing.Any]] = []
-    for team in team_file.teams:
-        ctfd_team = CTFdTeam(id=-1, name=team.name, email=team.email)
-
-        ctfd_users = [
-            CTFdUser(id=-1, name=user.name, email=user.email) for user in team.users
-        ]
-
-        errors = deploy_team(team=ctfd_team, users=ctfd_users, context=context)
-        all_errors += errors
-
-        print_errors(
-            prefix=[team.name or "team"],
-            errors=errors,
-            console=cli_context.console,
+    deploy_requests = [
+        (
+            CTFdTeam(id=-1, name=team.name, email=team.email),
+            [CTFdUser(id=-1, name=user.name, email=user.email) for user in team.users],
         )
+        for team in team_file.teams
+    ]
 
-        if not errors:
-            teams.append(
-                {
-                    **ctfd_team.model_dump(mode="json"),
-                    "users": [user.model_dump(mode="json") for user in ctfd_users],
-                }
+    all_errors: typing.List[LibError] = []
+    deployed: typing.Set[int] = set()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=CTFD_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                deploy_team, team=ctfd_team, users=ctfd_users, context=context
+            ): i
+            for i, (ctfd_team, ctfd_users) in enumerate(deploy_requests)
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            errors = future.result()
+            all_errors += errors
+
+            ctfd_team, _ = deploy_requests[i]
+
+            print_errors(
+                prefix=[ctfd_team.name or "team"],
+                errors=errors,
+                console=cli_context.console,
             )
 
+            if not errors:
+                deployed.add(i)
+
+    # Keep the config file order in the output
+    teams: typing.List[typing.Dict[str, typing.Any]] = [
+        {
+            **ctfd_team.model_dump(mode="json"),
+            "users": [user.model_dump(mode="json") for user in ctfd_users],
+        }
+        for i, (ctfd_team, ctfd_users) in enumerate(deploy_requests)
+        if i in deployed
+    ]
+
     out_json = {"teams": teams}
 
     if os.path.isfile(args.output):
-        with open(args.output) as h:
+        with open(args.output, "rb") as h:
             try:
-                old_json = json.load(h)
+                old_json = pydantic_core.from_json(h.read())
                 out_json = merge_teams_json(old_json, out_json)
             except ValueError:
                 pass
 
-    with open(args.output, "w") as h:
-        json.dump(out_json, h, indent=2)
+    with open(args.output, "wb") as h:
+        h.write(pydantic_core.to_json(out_json, indent=2))
 
     return get_exit_status(all_errors)
@@ -18,7 +18,6 @@ from ..common import (
     CliContext,
     WrapContext,
     cli_challenge_wrapper,
-    get_challenge_index,
     get_challenges,
     get_create_network,
     port_generator,
@@ -49,7 +48,7 @@ def start(track: Track, context: Context) -> typing.Sequence[LibError]:
         return [SkipError()]
 
     next_port = port_generator(
-        context.port + get_challenge_index(context.challenge_path) * CHALLENGE_MAX_PORTS
+        context.port + context.challenge_index * CHALLENGE_MAX_PORTS
     )
 
     errors: typing.List[LibError] = []
@@ -128,6 +127,7 @@ def cli(args: Args, cli_context: CliContext) -> bool:
 
         context = Context(
             challenge_path="",
+            challenge_index=-1,
             error_prefix=[network.name] if len(arg_networks) > 1 else [],
             skip_inactive=False,
             network=network,
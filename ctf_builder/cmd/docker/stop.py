@@ -79,6 +79,7 @@ def cli(args: Args, cli_context: CliContext) -> bool:
 
         context = Context(
             challenge_path="",
+            challenge_index=-1,
             error_prefix=[network.name] if len(arg_networks) > 1 else [],
             skip_inactive=False,
             network=network,
@@ -40,7 +40,6 @@ from ..common import (
     CliContext,
     WrapContext,
     cli_challenge_wrapper,
-    get_challenge_index,
     get_challenges,
     port_generator,
 )
@@ -96,7 +95,7 @@ def build(track: Track, context: Context) -> typing.Sequence[LibError]:
     os.makedirs(path, exist_ok=True)
 
     next_port = port_generator(
-        context.port + get_challenge_index(context.challenge_path) * CHALLENGE_MAX_PORTS
+        context.port + context.challenge_index * CHALLENGE_MAX_PORTS
     )
 
     errors: typing.List[LibError] = []
@@ -336,6 +335,7 @@ def cli_args(parser: argparse.ArgumentParser, root_directory: str) -> None:
 def cli(args: Args, cli_context: CliContext) -> bool:
     context = Context(
         challenge_path="",
+        challenge_index=-1,
         error_prefix=[],
         skip_inactive=False,
         output=args.output,
@@ -1,8 +1,17 @@
 CHALLENGE_BASE_PORT = 10_000
 CHALLENGE_MAX_PORTS = 5
+CHALLENGE_READ_WORKERS = 16
 
 CHALLENGE_HOST = "localhost"
 
+CTFD_POOL_SIZE = 32
+CTFD_WORKERS = 8
+CTFD_RETRIES = 3
+CTFD_RETRY_BACKOFF = 0.2
+CTFD_HEALTH_TIMEOUT = 20
+CTFD_HEALTH_MIN_SLEEP = 0.05
+CTFD_HEALTH_MAX_SLEEP = 0.5
+
 DEPLOY_NETWORK = "ctf-builder"
 DEPLOY_ATTEMPTS = 30
 DEPLOY_SLEEP = 1
@@ -1,8 +1,11 @@
+import contextlib
 import datetime
 import os.path
 import re
 import typing
 
+import pydantic
+import pydantic_core
 import requests
 
 from ..error import DeployError, LibError
@@ -18,11 +21,11 @@ from .models import (
     CTFdTeam,
     CTFdUser,
 )
-from .session import CTFdSession
+from .session import CTFdSession, create_session
 
 
-NONCE_RE = re.compile(r"<input id=\"nonce\".+?value=\"(.+?)\">")
-CSRF_RE = re.compile(r"'csrfNonce': \"(.*?)\"")
+NONCE_RE = re.compile(rb'<input id="nonce"[^>]*value="([^"]+)"')
+CSRF_RE = re.compile(rb"'csrfNonce': \"([^\"]*)\"")
 
 T = typing.TypeVar("T")
 
@@ -53,7 +56,7 @@ class CTFdAPI:
     def setup(
         cls, url: str, data: CTFdSetup, root: str = "", verify_ssl: bool = True
     ) -> typing.Sequence[LibError]:
-        sess = requests.Session()
+        sess = create_session()
 
         if (nonce := cls.read_nonce(sess, f"{url}/setup", verify_ssl)) is None:
             return [DeployError(context="Nonce", msg="failed to get")]
@@ -61,31 +64,42 @@ class CTFdAPI:
         data.nonce = nonce
 
         form = data.model_dump(mode="json")
-        files = {}
 
-        for key in ["ctf_logo", "ctf_banner", "ctf_small_icon"]:
-            if key not in form or not form[key]:
-                continue
+        with contextlib.ExitStack() as stack:
+            files = {}
 
-            files[key] = os.path.join(root, form[key])
+            for key in ["ctf_logo", "ctf_banner", "ctf_small_icon"]:
+                if not (file_path := form.pop(key, None)):
+                    continue
 
-        res = sess.post(f"{url}/setup", data=form, files=files, verify=verify_ssl)
+                path = os.path.join(root, file_path)
+                try:
+                    handle = stack.enter_context(open(path, "rb"))
+                except OSError as e:
+                    return [DeployError(context=key, msg="is not a file", error=e)]
+
+                files[key] = (os.path.basename(path), handle)
+
+            res = sess.post(f"{url}/setup", data=form, files=files, verify=verify_ssl)
 
         if res.status_code != 200:
             return [DeployError(context="Setup", msg="failed to deploy")]
 
         return []
 
-    def get_challenge_by_name(
-        self, name: str
+    def get_challenges(
+        self,
     ) -> typing.Tuple[
         typing.Optional[typing.List[CTFdChallenge]], typing.Sequence[LibError]
     ]:
-        res = self.__session.get("/challenges", data={"name": name})
+        # Admin view lists hidden challenges and skips anonymization
+        res = self.__session.get("/challenges", data={"view": "admin"})
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[CTFdChallenge]]](**res.json()),
-            context=f"Challenge {name}",
+            res=self.__parse(
+                res, CTFdResponse[typing.Optional[typing.List[CTFdChallenge]]]
+            ),
+            context="Challenges",
             msg="failed to get",
         )
 
@@ -93,11 +107,12 @@ class CTFdAPI:
         self, challenge: CTFdChallenge
     ) -> typing.Tuple[typing.Optional[CTFdChallenge], typing.Sequence[LibError]]:
         res = self.__session.post(
-            "/challenges", data=self.__cleanup_create(challenge.model_dump(mode="json"))
+            "/challenges",
+            data=challenge.model_dump_json(exclude_none=True, exclude={"id"}).encode(),
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdChallenge]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdChallenge]]),
             context=f"Challenge {challenge.name}",
             msg="failed to create",
         )
@@ -107,11 +122,11 @@ class CTFdAPI:
     ) -> typing.Tuple[typing.Optional[CTFdChallenge], typing.Sequence[LibError]]:
         res = self.__session.patch(
             f"/challenges/{challenge.id}",
-            data=self.__cleanup(challenge.model_dump(mode="json")),
+            data=challenge.model_dump_json(exclude_none=True).encode(),
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdChallenge]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdChallenge]]),
             context=f"Challenge {challenge.name}",
             msg="failed to update",
         )
@@ -119,30 +134,31 @@ class CTFdAPI:
     def delete_challenge(self, challenge_id: int) -> bool:
         res = self.__session.delete(f"/challenges/{challenge_id}")
 
-        return res.json()["success"] is True
+        return res.status_code == 200
 
-    def get_flags_in_challenge(
-        self, challenge_id: int
+    def get_flags(
+        self,
     ) -> typing.Tuple[
         typing.Optional[typing.List[CTFdFlag]], typing.Sequence[LibError]
     ]:
-        res = self.__session.get("/flags", data={"challenge_id": challenge_id})
+        res = self.__session.get("/flags")
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[CTFdFlag]]](**res.json()),
-            context=f"Challenge {challenge_id}",
-            msg="failed to get flags",
+            res=self.__parse(res, CTFdResponse[typing.Optional[typing.List[CTFdFlag]]]),
+            context="Flags",
+            msg="failed to get",
         )
 
     def create_flag(
         self, flag: CTFdFlag
     ) -> typing.Tuple[typing.Optional[CTFdFlag], typing.Sequence[LibError]]:
         res = self.__session.post(
-            "/flags", data=self.__cleanup_create(flag.model_dump(mode="json"))
+            "/flags",
+            data=flag.model_dump_json(exclude_none=True, exclude={"id"}).encode(),
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdFlag]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdFlag]]),
             context=f"Flag {flag.content}",
             msg="failed to create",
         )
@@ -150,7 +166,7 @@ class CTFdAPI:
     def delete_flag(self, flag_id: int) -> bool:
         res = self.__session.delete(f"/flags/{flag_id}")
 
-        return res.json()["success"] is True
+        return res.status_code == 200
 
     def get_files_in_challenge(
         self, challenge_id: int
@@ -160,7 +176,7 @@ class CTFdAPI:
         res = self.__session.get(f"/challenges/{challenge_id}/files")
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[CTFdFile]]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[typing.List[CTFdFile]]]),
             context=f"Challenge {challenge_id}",
             msg="failed to get files",
         )
@@ -170,14 +186,15 @@ class CTFdAPI:
     ) -> typing.Tuple[
         typing.Optional[typing.List[CTFdFile]], typing.Sequence[LibError]
     ]:
-        res = self.__session.post_data(
-            "/files",
-            data={"challenge": upload.challenge, "type": upload.type.value},
-            files={"file": (upload.file_name, upload.file_data)},
-        )
+        with upload.file_opener() as fh:
+            res = self.__session.post_data(
+                "/files",
+                data={"challenge": upload.challenge, "type": upload.type.value},
+                files={"file": (upload.file_name, fh)},
+            )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[CTFdFile]]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[typing.List[CTFdFile]]]),
             context=f"Challenge {upload.challenge}",
             msg="failed to upload file",
         )
@@ -185,30 +202,43 @@ class CTFdAPI:
     def delete_file(self, file_id: int) -> bool:
         res = self.__session.delete(f"/files/{file_id}")
 
-        return res.json()["success"] is True
+        return res.status_code == 200
 
-    def get_hints_in_challenge(
-        self, challenge_id: int
+    def get_hints(
+        self,
     ) -> typing.Tuple[
         typing.Optional[typing.List[CTFdHint]], typing.Sequence[LibError]
     ]:
-        res = self.__session.get("/hints", data={"challenge_id": challenge_id})
+        res = self.__session.get("/hints")
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[CTFdHint]]](**res.json()),
-            context=f"Challenge {challenge_id}",
-            msg="failed to get hints",
+            res=self.__parse(res, CTFdResponse[typing.Optional[typing.List[CTFdHint]]]),
+            context="Hints",
+            msg="failed to get",
+        )
+
+    def get_hint(
+        self, hint_id: int
+    ) -> typing.Tuple[typing.Optional[CTFdHint], typing.Sequence[LibError]]:
+        # Admins only get the content of locked hints in preview
+        res = self.__session.get(f"/hints/{hint_id}", data={"preview": True})
+
+        return self.__handle(
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdHint]]),
+            context=f"Hint {hint_id}",
+            msg="failed to get",
         )
 
     def create_hint(
         self, hint: CTFdHint
     ) -> typing.Tuple[typing.Optional[CTFdHint], typing.Sequence[LibError]]:
         res = self.__session.post(
-            "/hints", data=self.__cleanup_create(hint.model_dump(mode="json"))
+            "/hints",
+            data=hint.model_dump_json(exclude_none=True, exclude={"id"}).encode(),
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdHint]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdHint]]),
             context=f"Hint for Challenge {hint.challenge_id}",
             msg="failed to create",
         )
@@ -216,7 +246,7 @@ class CTFdAPI:
     def delete_hint(self, hint_id: int) -> bool:
         res = self.__session.delete(f"/hints/{hint_id}")
 
-        return res.json()["success"] is True
+        return res.status_code == 200
 
     def get_users_by_query(
         self, query: str
@@ -226,7 +256,7 @@ class CTFdAPI:
         res = self.__session.get("/users", data={"q": query})
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[CTFdUser]]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[typing.List[CTFdUser]]]),
             context=f"Users {query}",
             msg="failed to get",
         )
@@ -237,7 +267,7 @@ class CTFdAPI:
         res = self.__session.get(f"/teams/{team_id}/members")
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[int]]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[typing.List[int]]]),
             context=f"Team {team_id}",
             msg="failed to get users",
         )
@@ -245,7 +275,7 @@ class CTFdAPI:
     def add_user_to_team(self, team_id: int, user_id: int) -> bool:
         res = self.__session.post(
             f"/teams/{team_id}/members",
-            data={"user_id": user_id},
+            data=pydantic_core.to_json({"user_id": user_id}),
         )
 
         return res.status_code == 200
@@ -254,11 +284,12 @@ class CTFdAPI:
         self, user: CTFdUser
     ) -> typing.Tuple[typing.Optional[CTFdUser], typing.Sequence[LibError]]:
         res = self.__session.post(
-            "/users", data=self.__cleanup_create(user.model_dump(mode="json"))
+            "/users",
+            data=user.model_dump_json(exclude_none=True, exclude={"id"}).encode(),
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdUser]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdUser]]),
             context=f"User {user.email}",
             msg="failed to create",
         )
@@ -267,11 +298,11 @@ class CTFdAPI:
         self, user: CTFdUser
     ) -> typing.Tuple[typing.Optional[CTFdUser], typing.Sequence[LibError]]:
         res = self.__session.patch(
-            f"/users/{user.id}", data=self.__cleanup(user.model_dump(mode="json"))
+            f"/users/{user.id}", data=user.model_dump_json(exclude_none=True).encode()
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdUser]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdUser]]),
             context=f"User {user.email}",
             msg="failed to update",
         )
@@ -284,20 +315,27 @@ class CTFdAPI:
         res = self.__session.get("/teams", data={"q": query})
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[typing.List[CTFdTeam]]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[typing.List[CTFdTeam]]]),
             context=f"Teams {query}",
             msg="failed to get",
         )
 
+    def is_team_mode(self) -> bool:
+        # Team endpoints return 404 in user mode
+        res = self.__session.get("/teams", data={"per_page": 1})
+
+        return res.status_code != 404
+
     def create_team(
         self, team: CTFdTeam
     ) -> typing.Tuple[typing.Optional[CTFdTeam], typing.Sequence[LibError]]:
         res = self.__session.post(
-            "/teams", data=self.__cleanup_create(team.model_dump(mode="json"))
+            "/teams",
+            data=team.model_dump_json(exclude_none=True, exclude={"id"}).encode(),
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdTeam]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdTeam]]),
             context=f"Team {team.email}",
             msg="failed to create",
         )
@@ -306,11 +344,11 @@ class CTFdAPI:
         self, team: CTFdTeam
     ) -> typing.Tuple[typing.Optional[CTFdTeam], typing.Sequence[LibError]]:
         res = self.__session.patch(
-            f"/teams/{team.id}", self.__cleanup(team.model_dump(mode="json"))
+            f"/teams/{team.id}", team.model_dump_json(exclude_none=True).encode()
         )
 
         return self.__handle(
-            res=CTFdResponse[typing.Optional[CTFdTeam]](**res.json()),
+            res=self.__parse(res, CTFdResponse[typing.Optional[CTFdTeam]]),
             context=f"Team {team.email}",
             msg="failed to update",
         )
@@ -321,9 +359,9 @@ class CTFdAPI:
     ) -> typing.Optional[str]:
         res = sess.get(url, verify=verify_ssl)
 
-        match = NONCE_RE.findall(res.text)
+        match = NONCE_RE.search(res.content)
 
-        return match[0] if match else None
+        return match.group(1).decode() if match else None
 
     @classmethod
     def read_csrf(
@@ -331,15 +369,15 @@ class CTFdAPI:
     ) -> typing.Optional[str]:
         res = sess.get(url, verify=verify_ssl)
 
-        match = CSRF_RE.findall(res.text)
+        match = CSRF_RE.search(res.content)
 
-        return match[0] if match else None
+        return match.group(1).decode() if match else None
 
     @classmethod
     def create_access_token_auth(
         cls, url: str, name: str, password: str, verify_ssl: bool = True
     ) -> typing.Optional[CTFdAccessToken]:
-        sess = requests.Session()
+        sess = create_session()
 
         nonce = cls.read_nonce(sess, f"{url}/login", verify_ssl)
 
@@ -367,12 +405,23 @@ class CTFdAPI:
             verify=verify_ssl,
         )
 
-        data = CTFdResponse[CTFdAccessToken](**res.json())
+        data = cls.__parse(res, CTFdResponse[CTFdAccessToken])
         if not data.success:
             return None
 
         return data.data
 
+    @classmethod
+    def __parse(
+        cls, res: requests.Response, response_type: typing.Type[CTFdResponse[T]]
+    ) -> CTFdResponse[T]:
+        try:
+            return response_type.model_validate_json(res.content)
+        except pydantic.ValidationError:
+            return response_type(
+                success=False, message=f"unexpected response ({res.status_code})"
+            )
+
     @classmethod
     def __handle(
         cls, res: CTFdResponse[T], context: str = "", msg: str = ""
@@ -385,27 +434,3 @@ class CTFdAPI:
                 context=context, msg=msg, error=ValueError(res.message or res.errors)
             )
         ]
-
-    @classmethod
-    def __cleanup(
-        cls, data: typing.Dict[str, typing.Any]
-    ) -> typing.Dict[str, typing.Any]:
-        out = {}
-
-        for k, v in data.items():
-            if v is None:
-                continue
-
-            out[k] = v
-
-        return out
-
-    @classmethod
-    def __cleanup_create(
-        cls, data: typing.Dict[str, typing.Any]
-    ) -> typing.Dict[str, typing.Any]:
-        out = cls.__cleanup(data)
-
-        del out["id"]
-
-        return out
@@ -5,6 +5,7 @@ import docker
 import docker.errors
 import docker.models.containers
 
+from ..config import CTFD_HEALTH_MAX_SLEEP, CTFD_HEALTH_MIN_SLEEP, CTFD_HEALTH_TIMEOUT
 from ..error import DeployError, LibError
 
 
@@ -32,19 +33,23 @@ def ctfd_container(
         return None, [DeployError(context="Container", msg="failed to deploy", error=e)]
 
     try:
-        # Wait for container to be healthy
-        for _ in range(40):
+        # Wait for container to be healthy, polling quickly at first
+        deadline = time.perf_counter() + CTFD_HEALTH_TIMEOUT
+        delay = CTFD_HEALTH_MIN_SLEEP
+        while True:
             container.reload()
 
             if container.health == "healthy":
                 break
 
-            time.sleep(0.5)
-        else:
-            raise Exception("Not healthy")
+            if time.perf_counter() >= deadline:
+                raise Exception("Not healthy")
+
+            time.sleep(delay)
+            delay = min(delay * 2, CTFD_HEALTH_MAX_SLEEP)
     except Exception as e:
         try:
-            container.remove(force=True)
+            container.remove(v=True, force=True)
         except:
             pass
 
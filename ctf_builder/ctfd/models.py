@@ -149,7 +149,7 @@ class CTFdFileUpload:
     challenge: int
     type: CTFdFileUploadType
     file_name: str
-    file_data: typing.BinaryIO
+    file_opener: typing.Callable[[], typing.BinaryIO]
 
 
 class CTFdUserType(enum.Enum):
@@ -1,14 +1,49 @@
 import dataclasses
+import threading
 import typing
 import urllib.parse
 
 import requests
+import requests.adapters
+import urllib3.util.retry
 
-from ..config import CHALLENGE_HOST
+from ..config import CHALLENGE_HOST, CTFD_POOL_SIZE, CTFD_RETRIES, CTFD_RETRY_BACKOFF
 from .models import CTFdAccessToken
 
 
 VERSION = "/api/v1"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def create_adapter() -> requests.adapters.HTTPAdapter:
+    # Only idempotent methods are retried by default
+    retries = urllib3.util.retry.Retry(
+        total=CTFD_RETRIES,
+        backoff_factor=CTFD_RETRY_BACKOFF,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    )
+
+    return requests.adapters.HTTPAdapter(
+        pool_connections=CTFD_POOL_SIZE,
+        pool_maxsize=CTFD_POOL_SIZE,
+        max_retries=retries,
+    )
+
+
+# Shared so setup, login and API sessions reuse connections
+ADAPTER = create_adapter()
+
+# Bounds in-flight API requests to the connections the adapter keeps
+REQUEST_LIMIT = threading.BoundedSemaphore(CTFD_POOL_SIZE)
+
+
+def create_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", ADAPTER)
+    session.mount("https://", ADAPTER)
+
+    return session
 
 
 @dataclasses.dataclass(frozen=True)
@@ -16,9 +51,12 @@ class CTFdSession:
     url: str
     access_token: CTFdAccessToken
     verify_ssl: bool = dataclasses.field(default=True)
+    client: requests.Session = dataclasses.field(
+        default_factory=create_session, init=False, repr=False, compare=False
+    )
 
-    def __headers(self) -> typing.Dict[str, str]:
-        return {"Authorization": f"Token {self.access_token.value}"}
+    def __post_init__(self) -> None:
+        self.client.headers["Authorization"] = f"Token {self.access_token.value}"
 
     def __url(self, path: str) -> str:
         return f"{self.url}{VERSION}{path}"
@@ -29,43 +67,47 @@ class CTFdSession:
     def get(
         self, path: str, data: typing.Optional[typing.Dict[str, typing.Any]] = None
     ) -> requests.Response:
-        return requests.get(
-            url=self.__url(path),
-            headers={**self.__headers(), "Content-Type": "application/json"},
-            params=data,
-            verify=self.verify_ssl,
-        )
-
-    def post(self, path: str, data: typing.Dict[str, typing.Any]) -> requests.Response:
-        return requests.post(
-            url=self.__url(path),
-            headers=self.__headers(),
-            json=data,
-            verify=self.verify_ssl,
-        )
+        with REQUEST_LIMIT:
+            return self.client.get(
+                url=self.__url(path),
+                headers=JSON_HEADERS,
+                params=data,
+                verify=self.verify_ssl,
+            )
+
+    def post(self, path: str, data: bytes) -> requests.Response:
+        with REQUEST_LIMIT:
+            return self.client.post(
+                url=self.__url(path),
+                headers=JSON_HEADERS,
+                data=data,
+                verify=self.verify_ssl,
+            )
 
     def post_data(
         self, path: str, data: typing.Dict[str, typing.Any], files: typing.Any
     ) -> requests.Response:
-        return requests.post(
-            url=self.__url(path),
-            headers=self.__headers(),
-            data=data,
-            files=files,
-            verify=self.verify_ssl,
-        )
-
-    def patch(self, path: str, data: typing.Dict[str, typing.Any]) -> requests.Response:
-        return requests.patch(
-            url=self.__url(path),
-            headers=self.__headers(),
-            json=data,
-            verify=self.verify_ssl,
-        )
+        with REQUEST_LIMIT:
+            return self.client.post(
+                url=self.__url(path),
+                data=data,
+                files=files,
+                verify=self.verify_ssl,
+            )
+
+    def patch(self, path: str, data: bytes) -> requests.Response:
+        with REQUEST_LIMIT:
+            return self.client.patch(
+                url=self.__url(path),
+                headers=JSON_HEADERS,
+                data=data,
+                verify=self.verify_ssl,
+            )
 
     def delete(self, path: str) -> requests.Response:
-        return requests.delete(
-            url=self.__url(path),
-            headers={**self.__headers(), "Content-Type": "application/json"},
-            verify=self.verify_ssl,
-        )
+        with REQUEST_LIMIT:
+            return self.client.delete(
+                url=self.__url(path),
+                headers=JSON_HEADERS,
+                verify=self.verify_ssl,
+            )
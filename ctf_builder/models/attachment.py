@@ -19,7 +19,7 @@ class AttachmentContext:
 @dataclasses.dataclass(frozen=True)
 class AttachmentHandle:
     name: str
-    data: typing.BinaryIO
+    opener: typing.Callable[[], typing.BinaryIO]
 
 
 class BaseAttachment(abc.ABC, pydantic.BaseModel):
@@ -68,7 +68,7 @@ class DirectoryAttachment(BaseAttachment):
         else:
             name = os.path.basename(path) + ".zip"
 
-        return AttachmentHandle(name=name, data=data)
+        return AttachmentHandle(name=name, opener=lambda: data)
 
 
 class FileAttachment(BaseAttachment):
@@ -86,15 +86,13 @@ class FileAttachment(BaseAttachment):
         if (path := self.path.resolve(PathContext(root=context.root))) is None:
             return None
 
-        with open(path, "rb") as h:
-            data = h.read()
-
         if self.name is not None:
             name = self.name
         else:
             name = os.path.basename(path)
 
-        return AttachmentHandle(name=name, data=io.BytesIO(data))
+        # Open on upload so only in-flight files hold a descriptor
+        return AttachmentHandle(name=name, opener=lambda: open(path, "rb"))
 
 
 Attachment = typing.Union[DirectoryAttachment, FileAttachment]
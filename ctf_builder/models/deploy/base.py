@@ -1,5 +1,6 @@
 import abc
 import dataclasses
+import itertools
 import typing
 
 import docker
@@ -10,9 +11,8 @@ from ...k8s.models import K8sKind
 from ..port import Port
 
 
-def default_port_generator() -> typing.Generator[typing.Optional[int], None, None]:
-    while True:
-        yield None
+def default_port_generator() -> typing.Iterator[typing.Optional[int]]:
+    return itertools.repeat(None)
 
 
 @dataclasses.dataclass
@@ -24,8 +24,8 @@ class DockerDeployContext:
     )
     network: typing.Optional[str] = dataclasses.field(default=None)
     host: typing.Optional[str] = dataclasses.field(default=None)
-    port_generator: typing.Generator[typing.Optional[int], None, None] = (
-        dataclasses.field(default_factory=lambda: default_port_generator())
+    port_generator: typing.Iterator[typing.Optional[int]] = dataclasses.field(
+        default_factory=default_port_generator
     )
     tag: bool = dataclasses.field(default=True)
 
@@ -35,8 +35,8 @@ class K8sDeployContext:
     name: str
     root: str
     track: str
-    port_generator: typing.Generator[typing.Optional[int], None, None] = (
-        dataclasses.field(default_factory=lambda: default_port_generator())
+    port_generator: typing.Iterator[typing.Optional[int]] = dataclasses.field(
+        default_factory=default_port_generator
     )
 
 
@@ -1,5 +1,6 @@
 import dataclasses
 import enum
+import os
 import typing
 
 import pydantic
@@ -7,6 +8,9 @@ import pydantic
 from .path import FilePath, PathContext
 
 
+TEXT_CACHE: typing.Dict[str, typing.Tuple[typing.Tuple[int, int], str]] = {}
+
+
 class Language(enum.Enum):
     English = "en"
     French = "fr"
@@ -27,8 +31,19 @@ class Text(pydantic.BaseModel):
         if (path := self.path.resolve(PathContext(root=context.root))) is None:
             return None
 
+        file_stat = os.stat(path)
+        key = (file_stat.st_mtime_ns, file_stat.st_size)
+
+        cached = TEXT_CACHE.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
         with open(path, encoding="utf-8") as h:
-            return h.read().strip()
+            text = h.read().strip()
+
+        TEXT_CACHE[path] = (key, text)
+
+        return text
 
     @classmethod
     def build_many(cls, texts: typing.Sequence["Text"], context: TextContext) -> str:
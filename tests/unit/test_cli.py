@@ -0,0 +1,76 @@
+import argparse
+import os.path
+import typing
+
+import pytest
+
+from ctf_builder.cli import build_menu, select_path
+from ctf_builder.cmd.cli import CLI
+
+
+ROOT_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "sample"
+)
+
+
+def parse_args(argv: typing.Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quiet", action="store_true", default=False)
+
+    build_menu(parser, CLI, ROOT_DIRECTORY, select_path(CLI, argv))
+
+    return parser.parse_args(argv)
+
+
+def test_select_path() -> None:
+    assert select_path(CLI, ["doc", "-o", "out"]) == ["doc"]
+    assert select_path(CLI, ["--quiet", "ctfd", "dev"]) == ["ctfd", "dev"]
+    assert select_path(
+        CLI, ["ctfd", "deploy", "challenges", "-c", "sequence", "-k", "build"]
+    ) == ["ctfd", "deploy", "challenges"]
+    assert select_path(CLI, ["ctfd", "--help"]) == ["ctfd"]
+    assert select_path(CLI, ["unknown", "build"]) == []
+
+
+def test_nested_command_args() -> None:
+    args = parse_args(
+        ["ctfd", "deploy", "challenges", "-k", "key", "-c", "sequence", "-c", "static"]
+    )
+
+    assert (args._0, args._1, args._2) == ("ctfd", "deploy", "challenges")
+    assert args.api_key == "key"
+    assert args.challenge == ["sequence", "static"]
+
+
+def test_top_level_command_args() -> None:
+    args = parse_args(["--quiet", "build", "-c", "static"])
+
+    assert args.quiet
+    assert args._0 == "build"
+    assert args.challenge == ["static"]
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["--help"], "ctfd"),
+        (["ctfd", "--help"], "deploy"),
+        (["ctfd", "deploy", "--help"], "challenges"),
+        (["ctfd", "deploy", "challenges", "--help"], "--api_key"),
+    ],
+)
+def test_help(
+    argv: typing.List[str], expected: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as e:
+        parse_args(argv)
+
+    assert e.value.code == 0
+    assert expected in capsys.readouterr().out
+
+
+def test_invalid_command() -> None:
+    with pytest.raises(SystemExit) as e:
+        parse_args(["ctfd", "unknown"])
+
+    assert e.value.code == 2
@@ -0,0 +1,197 @@
+import concurrent.futures
+import copy
+import types
+import typing
+
+from ctf_builder.cmd.ctfd.challenges import Context, diff_entries, send_hints
+from ctf_builder.cmd.ctfd.teams import merge_teams_json
+from ctf_builder.ctfd.api import CTFdAPI
+from ctf_builder.ctfd.models import CTFdHint
+from ctf_builder.ctfd.session import CTFdSession
+from ctf_builder.error import LibError
+
+
+class RecordingSession:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.requests: typing.List[typing.Tuple[str, typing.Any]] = []
+
+    def get(
+        self, path: str, data: typing.Optional[typing.Dict[str, typing.Any]] = None
+    ) -> types.SimpleNamespace:
+        self.requests.append((path, data))
+
+        return types.SimpleNamespace(status_code=200, content=self.content)
+
+
+class HintAPI:
+    def __init__(self, hints: typing.List[CTFdHint]) -> None:
+        self.hints = {hint.id: hint for hint in hints}
+        self.deleted: typing.List[int] = []
+        self.created: typing.List[CTFdHint] = []
+
+    def get_hints(
+        self,
+    ) -> typing.Tuple[typing.List[CTFdHint], typing.Sequence[LibError]]:
+        # CTFd lists hints without their content
+        hints = [
+            hint.model_copy(update={"content": None}) for hint in self.hints.values()
+        ]
+
+        return hints, []
+
+    def get_hint(
+        self, hint_id: int
+    ) -> typing.Tuple[CTFdHint, typing.Sequence[LibError]]:
+        return self.hints[hint_id], []
+
+    def delete_hint(self, hint_id: int) -> bool:
+        self.deleted.append(hint_id)
+
+        return True
+
+    def create_hint(
+        self, hint: CTFdHint
+    ) -> typing.Tuple[CTFdHint, typing.Sequence[LibError]]:
+        self.created.append(hint)
+
+        return hint, []
+
+
+def test_diff_entries_unchanged() -> None:
+    stale, missing = diff_entries([("a", 1), ("b", 2)], [("b", "B"), ("a", "A")])
+
+    assert stale == []
+    assert missing == []
+
+
+def test_diff_entries_stale_and_missing() -> None:
+    stale, missing = diff_entries([("a", 1), ("b", 2)], [("a", "A"), ("c", "C")])
+
+    assert stale == [2]
+    assert missing == ["C"]
+
+
+def test_diff_entries_duplicates() -> None:
+    # Two existing copies of "a", one requested
+    stale, missing = diff_entries([("a", 1), ("a", 2)], [("a", "A")])
+
+    assert len(stale) == 1
+    assert stale[0] in (1, 2)
+    assert missing == []
+
+    # One existing copy of "a", two requested
+    stale, missing = diff_entries([("a", 1)], [("a", "A1"), ("a", "A2")])
+
+    assert stale == []
+    assert missing == ["A2"]
+
+
+def test_diff_entries_empty() -> None:
+    reqs: typing.List[typing.Tuple[str, str]] = []
+    stale, missing = diff_entries([("a", 1)], reqs)
+
+    assert stale == [1]
+    assert missing == []
+
+    stale, missing = diff_entries([], [("a", "A")])
+
+    assert stale == []
+    assert missing == ["A"]
+
+
+def test_merge_teams_json() -> None:
+    old = {
+        "teams": [
+            {
+                "email": "a@ctf.com",
+                "password": "team-a",
+                "users": [
+                    {"email": "a1@ctf.com", "password": "user-a1"},
+                    {"email": "a2@ctf.com"},
+                ],
+            },
+            {"email": "gone@ctf.com", "password": "gone", "users": []},
+        ]
+    }
+    new = {
+        "teams": [
+            {
+                "email": "a@ctf.com",
+                "password": "new-a",
+                "users": [
+                    {"email": "a1@ctf.com", "password": "new-a1"},
+                    {"email": "a2@ctf.com", "password": "new-a2"},
+                    {"email": "a3@ctf.com", "password": "new-a3"},
+                ],
+            },
+            {"email": "b@ctf.com", "password": "new-b", "users": []},
+        ]
+    }
+
+    old_copy = copy.deepcopy(old)
+    new_copy = copy.deepcopy(new)
+
+    out = merge_teams_json(old, new)
+
+    assert out == {
+        "teams": [
+            {
+                "email": "a@ctf.com",
+                "password": "team-a",
+                "users": [
+                    {"email": "a1@ctf.com", "password": "user-a1"},
+                    {"email": "a2@ctf.com", "password": "new-a2"},
+                    {"email": "a3@ctf.com", "password": "new-a3"},
+                ],
+            },
+            {"email": "b@ctf.com", "password": "new-b", "users": []},
+        ]
+    }
+
+    # Inputs are left untouched
+    assert old == old_copy
+    assert new == new_copy
+
+
+def test_get_hint_requests_preview() -> None:
+    session = RecordingSession(
+        b'{"success": true, "data": {"id": 1, "challenge_id": 2, "content": "hint"}}'
+    )
+
+    hint, errors = CTFdAPI(typing.cast(CTFdSession, session)).get_hint(1)
+
+    assert session.requests == [("/hints/1", {"preview": True})]
+    assert errors == []
+    assert hint is not None and hint.content == "hint"
+
+
+def test_send_hints() -> None:
+    api = HintAPI(
+        [
+            CTFdHint(id=1, challenge_id=1, content="same", cost=0),
+            CTFdHint(id=2, challenge_id=1, content="old", cost=5),
+            CTFdHint(id=3, challenge_id=9, content="other track", cost=0),
+        ]
+    )
+    new_hint = CTFdHint(id=-1, challenge_id=1, content="new", cost=5)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        context = Context(
+            challenge_path="",
+            challenge_index=0,
+            error_prefix=[],
+            skip_inactive=False,
+            api=typing.cast(CTFdAPI, api),
+            port=0,
+            executor=executor,
+        )
+
+        errors = send_hints(
+            [CTFdHint(id=-1, challenge_id=1, content="same", cost=0), new_hint],
+            context,
+        )
+
+    assert errors == []
+    assert api.deleted == [2]
+    assert api.created == [new_hint]